@@ -7,208 +7,470 @@ Usage:
   python chess_analyzer.py e4 e5              # Analyze after 1.e4 e5
   python chess_analyzer.py "start"            # Analyze starting position
   python chess_analyzer.py "<FEN string>"     # Analyze specific position
+  python chess_analyzer.py --interactive      # REPL: analyze positions on one engine
+  python chess_analyzer.py --serve            # Daemon: keep one engine warm for CLI calls
 
 Supports multiple input formats and provides move recommendations with reasoning.
 """
 
+import bisect
 import chess
 import chess.engine
 import chess.pgn
+import chess.polyglot
+import json
+import mmap
+import os
+import socket
+import struct
 import sys
 import re
-from typing import List, Tuple, Optional
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+# Square masks used by the positional heuristics, built once at import time.
+# Stored as plain int bitboards so a membership test is one AND against
+# chess.BB_SQUARES[square] rather than a set lookup.
+BB_CENTER = chess.BB_D4 | chess.BB_D5 | chess.BB_E4 | chess.BB_E5
+BB_EXTENDED_CENTER = (chess.BB_C3 | chess.BB_C4 | chess.BB_C5 | chess.BB_C6 |
+                      chess.BB_D3 | chess.BB_D6 | chess.BB_E3 | chess.BB_E6 |
+                      chess.BB_F3 | chess.BB_F4 | chess.BB_F5 | chess.BB_F6)
+
+# Piece names indexed by piece type, avoiding a function call per lookup on
+# the reasoning hot path.
+PIECE_NAMES = (None, "pawn", "knight", "bishop", "rook", "queen", "king")
+
+def _build_passed_pawn_masks():
+    """Per-color, per-square masks of the squares an enemy pawn would have
+    to occupy to stop the pawn: the three adjacent files, strictly ahead."""
+    masks = {chess.WHITE: [0] * 64, chess.BLACK: [0] * 64}
+    for square in chess.SQUARES:
+        file, rank = chess.square_file(square), chess.square_rank(square)
+        white_span = black_span = 0
+        for adjacent_file in (file - 1, file, file + 1):
+            if 0 <= adjacent_file <= 7:
+                for ahead_rank in range(rank + 1, 8):
+                    white_span |= chess.BB_SQUARES[chess.square(adjacent_file, ahead_rank)]
+                for ahead_rank in range(rank):
+                    black_span |= chess.BB_SQUARES[chess.square(adjacent_file, ahead_rank)]
+        masks[chess.WHITE][square] = white_span
+        masks[chess.BLACK][square] = black_span
+    return masks
+
+# The standard passed-pawn technique from bitboard engines: pawn is passed
+# iff its span mask ANDed with the enemy pawn bitboard is empty.
+PASSED_PAWN_MASKS = _build_passed_pawn_masks()
+
+def _ray_blocker(occupied: int, file: int, rank: int,
+                 file_step: int, rank_step: int) -> int:
+    """Walk a ray from (file, rank) and return the first occupied square.
+
+    Pure integer arithmetic over the occupancy bitboard - no Board objects -
+    so Numba can compile it to native code when installed. Returns -1 if the
+    ray runs off the board without hitting a piece.
+    """
+    file += file_step
+    rank += rank_step
+    while 0 <= file <= 7 and 0 <= rank <= 7:
+        square = rank * 8 + file
+        if occupied & (1 << square):
+            return square
+        file += file_step
+        rank += rank_step
+    return -1
+
+
+try:
+    # Optional: JIT the inner ray walk. The pure-Python fallback above is
+    # used unchanged when numba is not installed. The signature is pinned
+    # because lazy dispatch specializes on the first call's argument types:
+    # an occupancy below 2**63 would compile an int64 version that later
+    # overflows on full boards (any piece on h8 sets bit 63).
+    import numba
+    _ray_blocker = numba.njit(
+        "int64(uint64, int64, int64, int64, int64)", cache=True
+    )(_ray_blocker)
+except ImportError:
+    pass
+
+# Syntactic shape of a SAN token. One C-level match per token replaces the
+# old strip/isdigit/ellipsis conditionals: move-number prefixes ("1.", "3...")
+# are stripped by the optional leading group, pure noise tokens match with an
+# empty capture, and anything not shaped like SAN never reaches parse_san,
+# which is expensive (it disambiguates against full legal-move generation)
+# and would otherwise be driven by raised exceptions. The alternatives are
+# as permissive as parse_san itself: zero-notation castling ("0-0") and the
+# lax promotion suffixes ("bxa8=q", "e8Q") it accepts must pass the gate.
+_SAN_TOK = re.compile(
+    r'^(?:\d+\.*|\.+)?'
+    r'([0O]-[0O](?:-[0O])?[+#]?|[KQRBN]?[a-h]?[1-8]?x?[a-h][1-8](?:=?[QRBNqrbn])?[+#]?)?\.*$'
+)
+
+# (transposition key, SAN) -> parsed Move. parse_san disambiguates against
+# full legal-move generation, and the same opening tokens recur on the same
+# positions across interactive/daemon queries; Move objects are immutable so
+# sharing them is safe. Only successful parses are cached.
+_SAN_MOVE_CACHE = {}
+_SAN_MOVE_CACHE_MAX = 4096
+
+def _cached_parse_san(board: chess.Board, san: str) -> chess.Move:
+    """board.parse_san memoized by (transposition key, SAN)."""
+    key = (board._transposition_key(), san)
+    move = _SAN_MOVE_CACHE.get(key)
+    if move is None:
+        move = board.parse_san(san)
+        if len(_SAN_MOVE_CACHE) >= _SAN_MOVE_CACHE_MAX:
+            _SAN_MOVE_CACHE.clear()
+        _SAN_MOVE_CACHE[key] = move
+    return move
+
+# Fallback score for engine lines missing one; dict.get evaluates its
+# default eagerly, so building this PovScore inline would allocate it on
+# every PV even when a real score is present.
+_DEFAULT_SCORE = chess.engine.PovScore(chess.engine.Cp(0), chess.WHITE)
+
+# Centipawn display strings precomputed for the range engines actually
+# report; outside it the formatter runs as before. One dict probe replaces
+# CPython's format-string machinery on every rendered evaluation.
+_CP_FMT = {cp: f"{cp/100:+.2f}" for cp in range(-2000, 2001)}
+
+class MoveRecommendation:
+    """One recommended move with its evaluation, PV and reasoning.
+
+    The SAN rendering and the reasoning are computed lazily on first
+    access (and then cached), so a consumer that only looks at the top
+    move never pays SAN disambiguation or reasoning cost for the others;
+    the UCI string is always available. Access `move_san`/`reasoning`
+    before mutating the analyzed board - the deferred computations read
+    the board they were created from.
+
+    Supports tuple-style unpacking `(move, evaluation, pv, reasoning)` for
+    compatibility with existing callers.
+    """
+
+    def __init__(self, uci: str, evaluation: str, pv: str,
+                 san_fn: Callable[[], str], reasoning_fn: Callable[[], str],
+                 cp: Optional[int] = None, mate: Optional[int] = None):
+        self.uci = uci
+        self.evaluation = evaluation
+        # Raw score from White's perspective: centipawns, or moves-to-mate
+        # when `mate` is set. Kept numeric so consumers never re-parse the
+        # display string.
+        self.cp = cp
+        self.mate = mate
+        self.pv = pv
+        self._san_fn = san_fn
+        self._move_san = None
+        self._reasoning_fn = reasoning_fn
+        self._reasoning = None
+
+    @property
+    def move_san(self) -> str:
+        if self._move_san is None:
+            self._move_san = self._san_fn()
+            self._san_fn = None
+        return self._move_san
+
+    @property
+    def reasoning(self) -> str:
+        if self._reasoning is None:
+            self._reasoning = self._reasoning_fn()
+            self._reasoning_fn = None
+        return self._reasoning
+
+    def __iter__(self):
+        return iter((self.move_san, self.evaluation, self.pv, self.reasoning))
+
+# Live engines keyed by executable path, with a count of attached analyzers.
+# Constructing several ChessAnalyzer instances in one process reuses a single
+# Stockfish per path, so the startup cost (process spawn, UCI handshake, NNUE
+# load) is paid once and the engine's transposition table persists across
+# analyzers. No ucinewgame is sent between positions, so sibling-position
+# analyses hit the warm TT.
+#
+# Shutdown is deliberately NOT left to atexit: python-chess runs each engine
+# on a non-daemon thread, and the interpreter joins those threads before
+# atexit callbacks fire, so an atexit quit can never run and the process
+# hangs at exit. The last detaching analyzer quits the engine instead.
+_ENGINE_POOL = {}
+_ENGINE_REFS = {}
+
+def _pooled_engine(stockfish_path: str, threads: int, hash_mb: int) -> chess.engine.SimpleEngine:
+    """Fetch-or-create the shared engine for stockfish_path.
+
+    Threads/Hash are applied only when the engine is first spawned. Each
+    call takes a reference; pair it with _release_engine.
+    """
+    engine = _ENGINE_POOL.get(stockfish_path)
+    if engine is None:
+        engine = chess.engine.SimpleEngine.popen_uci(stockfish_path)
+        engine.configure({"Threads": threads, "Hash": hash_mb})
+        _ENGINE_POOL[stockfish_path] = engine
+        _ENGINE_REFS[stockfish_path] = 0
+    _ENGINE_REFS[stockfish_path] += 1
+    return engine
+
+def _release_engine(stockfish_path: str) -> None:
+    """Drop one reference to the pooled engine; quit it on the last one."""
+    if stockfish_path not in _ENGINE_POOL:
+        return
+    _ENGINE_REFS[stockfish_path] -= 1
+    if _ENGINE_REFS[stockfish_path] <= 0:
+        engine = _ENGINE_POOL.pop(stockfish_path)
+        del _ENGINE_REFS[stockfish_path]
+        try:
+            engine.quit()
+        except chess.engine.EngineError:
+            pass
+
+def close_all_engines() -> None:
+    """Shut down every pooled engine regardless of attached analyzers.
+
+    Safety net for error paths; must be called before the interpreter
+    starts exiting (see the pool comment above), so it is not registered
+    atexit.
+    """
+    for engine in _ENGINE_POOL.values():
+        try:
+            engine.quit()
+        except chess.engine.EngineError:
+            pass
+    _ENGINE_POOL.clear()
+    _ENGINE_REFS.clear()
 
 class ChessAnalyzer:
-    def __init__(self, stockfish_path="/usr/games/stockfish", depth=15):
-        """Initialize the chess analyzer with Stockfish engine."""
-        self.engine = chess.engine.SimpleEngine.popen_uci(stockfish_path)
+    def __init__(self, stockfish_path: str = "/usr/games/stockfish", depth: int = 15,
+                 threads: Optional[int] = None, hash_mb: int = 512,
+                 engine: Optional[chess.engine.SimpleEngine] = None,
+                 time_limit: Optional[float] = None):
+        """Initialize the chess analyzer with Stockfish engine.
+
+        By default the engine comes from a module-level pool keyed by path,
+        so repeated constructions reuse one warm Stockfish; passing `engine`
+        attaches to an already-running UCI engine instead (e.g. the one a
+        --serve daemon owns). threads defaults to all-but-one CPU core so
+        the engine search scales while leaving a core for Python; hash_mb
+        sizes the engine's transposition table (bigger = fewer re-searched
+        transpositions).
+        """
+        if engine is not None:
+            self.engine = engine
+            self._engine_path = None  # caller owns the engine's lifetime
+        else:
+            if threads is None:
+                threads = max(1, (os.cpu_count() or 2) - 1)
+            self.engine = _pooled_engine(stockfish_path, threads, hash_mb)
+            self._engine_path = stockfish_path
         self.depth = depth
-        
+        # Optional wall-clock cap per search: the engine stops at whichever
+        # of depth/time it hits first, bounding worst-case latency.
+        self.time_limit = time_limit
+        # Position -> (depth, results) cache so revisiting a position never
+        # restarts the engine search from depth 1.
+        self._analysis_cache = {}
+        
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Detach from the pooled engine, quitting it on the last detach.
+
+        Engines must be quit while the program is still running - their
+        non-daemon threads block interpreter exit - so lifetime follows the
+        analyzers instead of an atexit hook. Engines passed in via the
+        `engine` parameter belong to the caller and are left running.
+        """
+        if self._engine_path is not None:
+            _release_engine(self._engine_path)
+            self._engine_path = None
+        self.engine = None
+
     def __del__(self):
         """Clean up the engine when object is destroyed."""
-        if hasattr(self, 'engine'):
-            self.engine.quit()
+        try:
+            self.close()
+        except Exception:
+            pass
     
-    def parse_position(self, position_str: str) -> chess.Board:
+    @staticmethod
+    def parse_position(position_str: str) -> chess.Board:
         """Parse various chess position formats into a chess.Board object."""
         position_str = position_str.strip()
-        
-        # Starting position keywords - check this first
+
+        # Starting position keywords - cheapest test, check this first
         if position_str.lower() in ['start', 'starting', 'initial', 'new']:
             return chess.Board()
-        
+
+        # Tokenize once; both the FEN sniff and the move loop reuse it
+        tokens = position_str.replace(',', ' ').split()
+        looks_like_fen = len(tokens) >= 4 and '/' in tokens[0]
+
         # FEN notation
-        if len(position_str.split()) >= 4 and ('/' in position_str):
+        if looks_like_fen:
             try:
                 return chess.Board(position_str)
             except ValueError:
                 pass
-        
+
         # PGN notation (sequence of moves) - try parsing as moves if it looks like algebraic notation
-        if not ('/' in position_str and len(position_str.split()) >= 4):  # Not FEN
-            try:
-                board = chess.Board()
-                # Split by spaces and clean up
-                moves = position_str.replace(',', ' ').split()
-                invalid_moves = []
-                
-                # First pass: validate all moves before processing any
-                temp_board = chess.Board()
-                for i, move_str in enumerate(moves):
-                    move_str = move_str.strip('.,')
-                    if move_str and not move_str.isdigit() and move_str != '...':
-                        try:
-                            move = temp_board.parse_san(move_str)
-                            temp_board.push(move)
-                        except ValueError:
-                            # Track invalid moves with their position
-                            invalid_moves.append((i + 1, move_str))
-                
-                # If any invalid moves found, reject the entire sequence
-                if invalid_moves:
-                    invalid_list = ", ".join([f"{Colors.RED}'{move}'{Colors.RESET} (position {pos})" for pos, move in invalid_moves])
-                    total_moves = len([m for m in moves if m.strip('.,') and not m.isdigit() and m != '...'])
-                    raise ValueError(f"\n{Colors.RED}Invalid move sequence:{Colors.RESET} {invalid_list}\n")
-                
-                # If all moves are valid, process them
-                move_count = 0
-                for move_str in moves:
-                    move_str = move_str.strip('.,')
-                    if move_str and not move_str.isdigit() and move_str != '...':
-                        move = board.parse_san(move_str)
-                        board.push(move)
-                        move_count += 1
-                
-                # If we successfully parsed at least one move, return the board
-                if move_count > 0:
-                    return board
-            except ValueError:
-                # Re-raise ValueError with move parsing details
-                raise
-            except:
-                pass
-        
+        if not looks_like_fen:
+            # Single pass: build the real board as we validate. On any
+            # invalid move the whole sequence is rejected anyway, so the
+            # separate validation board only doubled the parse_san work.
+            board = chess.Board()
+            invalid_moves = []
+            move_count = 0
+            for i, move_str in enumerate(tokens):
+                m = _SAN_TOK.match(move_str)
+                if m is not None:
+                    san = m.group(1)
+                    if not san:
+                        # Bare move number or ellipsis - skip
+                        continue
+                else:
+                    # The regex is a fast-path gate, not the authority on
+                    # validity: give parse_san one look at anything it
+                    # doesn't recognize before rejecting the token.
+                    san = move_str
+                try:
+                    board.push(_cached_parse_san(board, san))
+                    move_count += 1
+                except ValueError:
+                    # Track invalid moves with their position
+                    invalid_moves.append((i + 1, move_str))
+
+            # If any invalid moves found, reject the entire sequence
+            if invalid_moves:
+                invalid_list = ", ".join([f"{Colors.RED}'{move}'{Colors.RESET} (position {pos})" for pos, move in invalid_moves])
+                raise ValueError(f"\n{Colors.RED}Invalid move sequence:{Colors.RESET} {invalid_list}\n")
+
+            # If we successfully parsed at least one move, return the board
+            if move_count > 0:
+                return board
+
         # If nothing else works, try as FEN
         try:
             return chess.Board(position_str)
-        except:
+        except ValueError:
             raise ValueError(f"Could not parse position: {position_str}")
     
-    def detect_tactical_patterns(self, board: chess.Board, move: chess.Move) -> List[str]:
-        """Detect tactical patterns and motifs in the move."""
+    def detect_tactical_patterns(self, board: chess.Board, move: chess.Move,
+                                 board_after: Optional[chess.Board] = None,
+                                 from_piece: Optional[chess.Piece] = None,
+                                 to_piece: Optional[chess.Piece] = None) -> List[str]:
+        """Detect tactical patterns and motifs in the move.
+
+        `board_after` is the position with `move` already played, and
+        `from_piece`/`to_piece` are the pre-move occupants of the move's
+        squares; callers that analyze several aspects of one move (see
+        `get_move_reasoning`) compute these once and share them across all
+        the helpers.
+        """
         patterns = []
-        board_copy = board.copy()
-        
+
         # Check if move creates or exploits tactical motifs
-        piece = board.piece_at(move.from_square)
-        target_piece = board.piece_at(move.to_square)
-        
+        piece = from_piece if from_piece is not None else board.piece_at(move.from_square)
+        if piece is None:
+            return patterns
+        ptype = piece.piece_type
+
+        if board_after is None:
+            board_after = board.copy(stack=False)
+            board_after.push(move)
+
         # Fork detection
-        if piece and piece.piece_type == chess.KNIGHT:
-            board_copy.push(move)
-            attacks = list(board_copy.attacks(move.to_square))
+        if ptype == chess.KNIGHT:
             valuable_targets = []
-            for square in attacks:
-                attacked_piece = board_copy.piece_at(square)
+            for square in board_after.attacks(move.to_square):
+                attacked_piece = board_after.piece_at(square)
                 if attacked_piece and attacked_piece.color != piece.color:
                     if attacked_piece.piece_type in [chess.KING, chess.QUEEN, chess.ROOK]:
                         valuable_targets.append(attacked_piece.piece_type)
             if len(valuable_targets) >= 2:
                 patterns.append("Creates knight fork")
-            board_copy.pop()
-        
-        # Pin detection
-        if piece and piece.piece_type in [chess.BISHOP, chess.ROOK, chess.QUEEN]:
-            board_copy.push(move)
+
+        # Pin detection (sliders only; mutually exclusive with the fork branch)
+        elif ptype in (chess.BISHOP, chess.ROOK, chess.QUEEN):
             # Check if move creates a pin along the piece's attack lines
-            for square in board_copy.attacks(move.to_square):
-                pinned_piece = board_copy.piece_at(square)
+            for square in board_after.attacks(move.to_square):
+                pinned_piece = board_after.piece_at(square)
                 if pinned_piece and pinned_piece.color != piece.color:
                     # Check if there's a more valuable piece behind it
                     from_file, from_rank = chess.square_file(move.to_square), chess.square_rank(move.to_square)
                     to_file, to_rank = chess.square_file(square), chess.square_rank(square)
-                    
+
                     # Calculate direction
                     file_diff = to_file - from_file
                     rank_diff = to_rank - from_rank
-                    
+
                     if file_diff != 0:
                         file_diff = file_diff // abs(file_diff)
                     if rank_diff != 0:
                         rank_diff = rank_diff // abs(rank_diff)
-                    
+
                     # Look beyond the pinned piece
-                    next_file = to_file + file_diff
-                    next_rank = to_rank + rank_diff
-                    
-                    while 0 <= next_file <= 7 and 0 <= next_rank <= 7:
-                        next_square = chess.square(next_file, next_rank)
-                        behind_piece = board_copy.piece_at(next_square)
-                        if behind_piece:
-                            if (behind_piece.color != piece.color and 
-                                behind_piece.piece_type > pinned_piece.piece_type):
-                                patterns.append(f"Pins {chess.piece_name(pinned_piece.piece_type)}")
-                            break
-                        next_file += file_diff
-                        next_rank += rank_diff
-            board_copy.pop()
-        
-        # Skewer detection (similar to pin but with valuable piece in front)
-        if piece and piece.piece_type in [chess.BISHOP, chess.ROOK, chess.QUEEN]:
+                    behind_square = _ray_blocker(board_after.occupied, to_file, to_rank,
+                                                 file_diff, rank_diff)
+                    if behind_square >= 0:
+                        behind_piece = board_after.piece_at(behind_square)
+                        if (behind_piece.color != piece.color and
+                            behind_piece.piece_type > pinned_piece.piece_type):
+                            patterns.append(f"Pins {PIECE_NAMES[pinned_piece.piece_type]}")
+
+            # Skewer detection (similar to pin but with valuable piece in front)
+            target_piece = to_piece if to_piece is not None else board.piece_at(move.to_square)
             if target_piece and target_piece.piece_type in [chess.KING, chess.QUEEN]:
                 patterns.append("Creates skewer threat")
-        
-        # Discovered attack
-        if piece:
-            # Check if moving this piece reveals an attack from another piece
-            for square in chess.SQUARES:
-                ally_piece = board.piece_at(square)
-                if (ally_piece and ally_piece.color == piece.color and 
-                    ally_piece.piece_type in [chess.BISHOP, chess.ROOK, chess.QUEEN]):
-                    # Check if move.from_square was blocking ally_piece's attack
-                    attacks_before = list(board.attacks(square))
-                    board_copy.push(move)
-                    attacks_after = list(board_copy.attacks(square))
-                    board_copy.pop()
-                    
-                    new_attacks = set(attacks_after) - set(attacks_before)
-                    for new_target in new_attacks:
-                        attacked_piece = board.piece_at(new_target)
-                        if (attacked_piece and attacked_piece.color != piece.color and
-                            attacked_piece.piece_type in [chess.KING, chess.QUEEN, chess.ROOK]):
-                            patterns.append("Discovered attack")
-                            break
-        
+
+        # Discovered attack - not gated on piece type: any mover, the king
+        # included, can step off a friendly slider's line.
+        # Pure mask arithmetic: newly attacked squares are after & ~before,
+        # and a hit is that mask ANDed with the valuable enemy pieces - no
+        # Python sets, no per-square piece_at probes.
+        # Only sliders can be unmasked; walk the set bits of the friendly
+        # slider bitboard instead of probing all 64 squares
+        candidates = board.occupied_co[piece.color] & (board.bishops | board.rooks | board.queens)
+        valuable = board.occupied_co[not piece.color] & (board.kings | board.queens | board.rooks)
+        for square in chess.scan_forward(candidates):
+            new_mask = board_after.attacks_mask(square) & ~board.attacks_mask(square)
+            if new_mask & valuable:
+                patterns.append("Discovered attack")
+
         return patterns
 
-    def analyze_positional_factors(self, board: chess.Board, move: chess.Move) -> List[str]:
+    def analyze_positional_factors(self, board: chess.Board, move: chess.Move,
+                                   board_after: Optional[chess.Board] = None,
+                                   from_piece: Optional[chess.Piece] = None) -> List[str]:
         """Analyze positional aspects of the move."""
         factors = []
-        piece = board.piece_at(move.from_square)
-        
+        piece = from_piece if from_piece is not None else board.piece_at(move.from_square)
+
         if not piece:
             return factors
-        
-        board_copy = board.copy()
-        
-        # Piece activity analysis
-        attacks_before = len(list(board.attacks(move.from_square)))
-        board_copy.push(move)
-        attacks_after = len(list(board_copy.attacks(move.to_square)))
-        board_copy.pop()
+
+        if board_after is None:
+            board_after = board.copy(stack=False)
+            board_after.push(move)
+
+        # Piece activity analysis - popcount straight on the attack mask;
+        # attacks_mask() skips even the SquareSet wrapper that attacks()
+        # allocates
+        attacks_before = chess.popcount(board.attacks_mask(move.from_square))
+        attacks_after = chess.popcount(board_after.attacks_mask(move.to_square))
         
         if attacks_after > attacks_before + 1:
-            factors.append(f"Increases {chess.piece_name(piece.piece_type)} activity")
+            factors.append(f"Increases {PIECE_NAMES[piece.piece_type]} activity")
         
         # Central control
-        central_squares = {chess.D4, chess.D5, chess.E4, chess.E5}
-        extended_center = {chess.C3, chess.C4, chess.C5, chess.C6, 
-                          chess.D3, chess.D6, chess.E3, chess.E6,
-                          chess.F3, chess.F4, chess.F5, chess.F6}
-        
-        if move.to_square in central_squares:
+        to_bb = chess.BB_SQUARES[move.to_square]
+        if to_bb & BB_CENTER:
             factors.append("Controls central square")
-        elif move.to_square in extended_center:
+        elif to_bb & BB_EXTENDED_CENTER:
             factors.append("Supports center control")
         
         # King safety considerations
@@ -225,7 +487,7 @@ class ChessAnalyzer:
         if piece.piece_type in [chess.KNIGHT, chess.BISHOP]:
             back_rank = 0 if piece.color == chess.WHITE else 7
             if chess.square_rank(move.from_square) == back_rank:
-                factors.append(f"Develops {chess.piece_name(piece.piece_type)}")
+                factors.append(f"Develops {PIECE_NAMES[piece.piece_type]}")
         
         # Pawn structure considerations
         if piece.piece_type == chess.PAWN:
@@ -236,42 +498,48 @@ class ChessAnalyzer:
                 factors.append("Advances pawn to strong outpost")
             
             # Pawn support
-            board_copy.push(move)
             pawn_file = chess.square_file(move.to_square)
             for adjacent_file in [pawn_file - 1, pawn_file + 1]:
                 if 0 <= adjacent_file <= 7:
                     support_square = chess.square(adjacent_file, chess.square_rank(move.to_square) - (1 if piece.color == chess.WHITE else -1))
                     if 0 <= support_square <= 63:
-                        support_piece = board_copy.piece_at(support_square)
-                        if (support_piece and support_piece.piece_type == chess.PAWN and 
+                        support_piece = board_after.piece_at(support_square)
+                        if (support_piece and support_piece.piece_type == chess.PAWN and
                             support_piece.color == piece.color):
                             factors.append("Creates pawn chain")
                             break
-            board_copy.pop()
         
         return factors
 
-    def get_opening_context(self, board: chess.Board, move: chess.Move) -> str:
+    def get_opening_context(self, board: chess.Board, move: chess.Move,
+                            board_after: Optional[chess.Board] = None,
+                            from_piece: Optional[chess.Piece] = None) -> str:
         """Get opening-specific context for the move."""
         # Check if we're still in opening (rough heuristic)
         if len(board.move_stack) > 15:
             return ""
-        
+
+        # Positions handed in as FEN carry no move stack; use the move
+        # counter to skip opening detection for middlegame positions.
+        if not board.move_stack and board.fullmove_number > 8:
+            return ""
+
         # Get current opening name
         opening = detect_opening(board)
         if not opening:
             return ""
-        
-        # Make the move and see if it leads to a known opening
-        board_copy = board.copy()
-        board_copy.push(move)
-        new_opening = detect_opening(board_copy)
-        
+
+        # See if the move leads to a known opening
+        if board_after is None:
+            board_after = board.copy(stack=False)
+            board_after.push(move)
+        new_opening = detect_opening(board_after)
+
         if new_opening and new_opening != opening:
             return f"Transitions to {new_opening}"
         elif opening:
             # Common opening principles
-            piece = board.piece_at(move.from_square)
+            piece = from_piece if from_piece is not None else board.piece_at(move.from_square)
             if piece and piece.piece_type == chess.KNIGHT:
                 if move.to_square in [chess.F3, chess.C3] and piece.color == chess.WHITE:
                     return "Follows opening principle: knights before bishops"
@@ -286,16 +554,17 @@ class ChessAnalyzer:
         
         return ""
 
-    def evaluate_endgame_factors(self, board: chess.Board, move: chess.Move) -> List[str]:
+    def evaluate_endgame_factors(self, board: chess.Board, move: chess.Move,
+                                 from_piece: Optional[chess.Piece] = None) -> List[str]:
         """Analyze endgame-specific factors."""
         factors = []
-        
-        # Simple material count to detect endgame
-        material_count = sum(1 for square in chess.SQUARES 
-                           if board.piece_at(square) and board.piece_at(square).piece_type != chess.KING)
-        
+
+        # Simple material count to detect endgame: one AND plus a popcount
+        # instead of 128 piece_at probes
+        material_count = chess.popcount(board.occupied & ~board.kings)
+
         if material_count <= 12:  # Rough endgame threshold
-            piece = board.piece_at(move.from_square)
+            piece = from_piece if from_piece is not None else board.piece_at(move.from_square)
             
             if piece and piece.piece_type == chess.KING:
                 factors.append("King activation in endgame")
@@ -310,25 +579,10 @@ class ChessAnalyzer:
                     factors.append("Centralizes king")
             
             elif piece and piece.piece_type == chess.PAWN:
-                # Passed pawn advancement
-                pawn_file = chess.square_file(move.to_square)
-                is_passed = True
-                
-                for rank in range(8):
-                    for file_offset in [-1, 0, 1]:
-                        check_file = pawn_file + file_offset
-                        if 0 <= check_file <= 7:
-                            check_square = chess.square(check_file, rank)
-                            enemy_piece = board.piece_at(check_square)
-                            if (enemy_piece and enemy_piece.piece_type == chess.PAWN and 
-                                enemy_piece.color != piece.color):
-                                # Check if this pawn blocks our pawn's advance
-                                if piece.color == chess.WHITE and rank > chess.square_rank(move.to_square):
-                                    is_passed = False
-                                elif piece.color == chess.BLACK and rank < chess.square_rank(move.to_square):
-                                    is_passed = False
-                
-                if is_passed:
+                # Passed pawn advancement: one AND of the precomputed span
+                # mask against the enemy pawn bitboard
+                enemy_pawns = board.pawns & board.occupied_co[not piece.color]
+                if not (PASSED_PAWN_MASKS[piece.color][move.to_square] & enemy_pawns):
                     factors.append("Advances passed pawn")
         
         return factors
@@ -336,39 +590,54 @@ class ChessAnalyzer:
     def get_move_reasoning(self, board: chess.Board, move: chess.Move) -> str:
         """Generate comprehensive reasoning for why a move is good."""
         reasoning_parts = []
-        
+
+        # Resolve the move's squares once; every helper below needs the same
+        # two pieces and piece_at walks all six piece bitboards per probe.
+        from_piece = board.piece_at(move.from_square)
+        to_piece = board.piece_at(move.to_square)
+
         # 1. Basic tactical elements
         basic_tactics = []
-        if board.is_capture(move):
-            captured_piece = board.piece_at(move.to_square)
-            if captured_piece:
-                basic_tactics.append(f"Captures {captured_piece.symbol().upper()}")
-        
-        board_copy = board.copy()
-        board_copy.push(move)
-        
-        if board_copy.is_checkmate():
-            basic_tactics.append("Checkmate!")
-        elif board_copy.is_check():
-            basic_tactics.append("Gives check")
-        
+        # Capture test as a single AND against the opponent's occupancy
+        # bitboard rather than is_capture()'s piece_at round-trip
+        if (board.occupied_co[not board.turn] & chess.BB_SQUARES[move.to_square]) or board.is_en_passant(move):
+            if to_piece:
+                basic_tactics.append(f"Captures {to_piece.symbol().upper()}")
+
+        # Build the post-move position once and share it with every helper
+        # below, instead of each one pushing and popping the same move.
+        board_after = board.copy(stack=False)
+        board_after.push(move)
+
+        # Derive the checkers mask once; is_checkmate()/is_check() would
+        # each recompute it
+        checkers = board_after.checkers_mask()
+        if checkers:
+            if not any(board_after.generate_legal_moves()):
+                basic_tactics.append("Checkmate!")
+            else:
+                basic_tactics.append("Gives check")
+
+
         if move.promotion:
-            basic_tactics.append(f"Promotes to {chess.piece_name(move.promotion)}")
+            basic_tactics.append(f"Promotes to {PIECE_NAMES[move.promotion]}")
         
         if board.is_castling(move):
             basic_tactics.append("Castles for king safety")
         
         # 2. Advanced tactical patterns
-        tactical_patterns = self.detect_tactical_patterns(board, move)
-        
+        tactical_patterns = self.detect_tactical_patterns(board, move, board_after,
+                                                          from_piece, to_piece)
+
         # 3. Positional factors
-        positional_factors = self.analyze_positional_factors(board, move)
-        
+        positional_factors = self.analyze_positional_factors(board, move, board_after,
+                                                             from_piece)
+
         # 4. Opening context
-        opening_context = self.get_opening_context(board, move)
-        
+        opening_context = self.get_opening_context(board, move, board_after, from_piece)
+
         # 5. Endgame considerations
-        endgame_factors = self.evaluate_endgame_factors(board, move)
+        endgame_factors = self.evaluate_endgame_factors(board, move, from_piece)
         
         # Compile reasoning with priorities
         if basic_tactics:
@@ -388,27 +657,89 @@ class ChessAnalyzer:
         
         # If no specific reasoning found, provide generic positional assessment
         if not reasoning_parts:
-            piece = board.piece_at(move.from_square)
-            if piece:
-                reasoning_parts.append(f"Improves {chess.piece_name(piece.piece_type)} position")
+            if from_piece:
+                reasoning_parts.append(f"Improves {PIECE_NAMES[from_piece.piece_type]} position")
             else:
                 reasoning_parts.append("Positional improvement")
         
         return "; ".join(reasoning_parts)
     
-    def analyze_position(self, board: chess.Board, num_moves=3) -> List[Tuple[str, float, str, str]]:
+    # Stop the iterative deepening early once the best move and score have
+    # been stable this many consecutive depths (and past this depth).
+    _STABLE_DEPTHS = 2
+    _MIN_STOP_DEPTH = 8
+    _STABLE_SCORE_DELTA = 10  # centipawns
+
+    def _search(self, board: chess.Board, num_moves: int) -> List[dict]:
+        """Run the engine search, cutting iterative deepening short when the
+        top move stabilizes.
+
+        Streams info lines from engine.analysis() and keeps the newest line
+        per multipv rank. When the depth-N best move matches depth-N-1 and
+        the score moved by less than _STABLE_SCORE_DELTA centipawns for
+        _STABLE_DEPTHS consecutive depths, the search is stopped - easy
+        positions finish in a fraction of the fixed-depth node budget while
+        hard positions still run to self.depth. Only score and pv are
+        consumed, so the info mask tells python-chess to skip parsing the
+        other fields (nps, hashfull, currmove, ...).
+        """
+        latest = {}
+        previous_best = None  # (depth, move, score)
+        stable_depths = 0
+        limit = chess.engine.Limit(depth=self.depth, time=self.time_limit)
+        # Only ask for MultiPV when more than one line is wanted: MultiPV
+        # forces the engine into its slower multi-line search mode, and the
+        # single-line default search is noticeably faster.
+        multipv = num_moves if num_moves > 1 else None
+        with self.engine.analysis(board, limit, multipv=multipv,
+                                  info=chess.engine.INFO_SCORE | chess.engine.INFO_PV) as stream:
+            for line in stream:
+                if 'pv' not in line or 'score' not in line:
+                    continue
+                rank = line.get('multipv', 1)
+                latest[rank] = line
+
+                depth = line.get('depth')
+                if rank != 1 or depth is None:
+                    continue
+                best_move = line['pv'][0]
+                score = line['score'].white().score(mate_score=100000)
+                if previous_best is not None and depth > previous_best[0]:
+                    if (best_move == previous_best[1] and
+                            abs(score - previous_best[2]) < self._STABLE_SCORE_DELTA):
+                        stable_depths += 1
+                    else:
+                        stable_depths = 0
+                if depth != (previous_best[0] if previous_best else None):
+                    previous_best = (depth, best_move, score)
+                if depth >= self._MIN_STOP_DEPTH and stable_depths >= self._STABLE_DEPTHS:
+                    break
+        return [latest[rank] for rank in sorted(latest)]
+
+    def analyze_position(self, board: chess.Board, num_moves: int = 3) -> List[MoveRecommendation]:
         """Analyze position and return top moves with evaluations and reasoning."""
+        # python-chess's transposition key: a tuple of the raw bitboards plus
+        # turn/castling/ep, already maintained incrementally by the board -
+        # no string serialization, and transpositions hit the same entry.
+        cache_key = board._transposition_key()
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            cached_depth, cached_results = cached
+            if cached_depth >= self.depth and len(cached_results) >= num_moves:
+                return cached_results[:num_moves]
+
         try:
-            # Get analysis from Stockfish
-            info = self.engine.analyse(board, chess.engine.Limit(depth=self.depth), multipv=num_moves)
-            
+            info = self._search(board, num_moves)
+
             results = []
             for i, analysis in enumerate(info[:num_moves]):
                 if 'pv' in analysis and analysis['pv']:
                     move = analysis['pv'][0]
-                    score = analysis.get('score', chess.engine.PovScore(chess.engine.Cp(0), chess.WHITE))
+                    score = analysis.get('score', _DEFAULT_SCORE)
                     
                     # Convert score to centipawns from White's perspective (always)
+                    cp_score = None
+                    mate_value = None
                     if score.is_mate():
                         mate_value = score.white().mate()
                         if mate_value > 0:
@@ -418,28 +749,97 @@ class ChessAnalyzer:
                     else:
                         # Always show score from White's perspective
                         cp_score = score.white().score()
-                        eval_str = f"{cp_score/100:+.2f}"
-                    
-                    # Get principal variation (first few moves)
-                    pv_moves = analysis['pv'][:4]  # Show first 4 moves of PV
-                    board_copy = board.copy()
-                    pv_moves_san = []
-                    for pv_move in pv_moves:
-                        if pv_move in board_copy.legal_moves:
-                            pv_moves_san.append(board_copy.san(pv_move))
-                            board_copy.push(pv_move)
-                        else:
-                            break
-                    pv_str = " ".join(pv_moves_san)
+                        eval_str = _CP_FMT.get(cp_score) or f"{cp_score/100:+.2f}"
                     
-                    reasoning = self.get_move_reasoning(board, move)
+                    # Get principal variation (first 4 moves). variation_san
+                    # renders the whole line in one pass on its own internal
+                    # scratch board, leaving `board` untouched; the manual
+                    # loop paid a full legal-move generation per PV move
+                    # just to re-check legality.
+                    try:
+                        pv_str = board.variation_san(analysis['pv'][:4])
+                    except (ValueError, AssertionError):
+                        pv_str = ""
                     
-                    results.append((board.san(move), eval_str, pv_str, reasoning))
-            
+                    # Defer SAN rendering and reasoning until someone
+                    # actually reads them; the cheap UCI string is stored
+                    # eagerly for cache keys and programmatic consumers.
+                    san_fn = (lambda mv=move: board.san(mv))
+                    reasoning_fn = (lambda mv=move: self.get_move_reasoning(board, mv))
+
+                    results.append(MoveRecommendation(move.uci(), eval_str, pv_str, san_fn, reasoning_fn,
+                                                      cp=cp_score, mate=mate_value))
+
+            # Reasoning for one PV move never depends on another, and the
+            # helpers only read the analyzed board (the post-move state lives
+            # on a private copy), so the multipv reasonings can be computed
+            # concurrently. SAN rendering is the one exception: board.san
+            # pushes and pops on the shared board, so resolve every SAN here,
+            # before the pool threads start reading that board. Then start
+            # the futures; the lazy property just collects the finished
+            # future on first access.
+            if len(results) > 1:
+                for rec in results:
+                    rec.move_san
+                executor = ThreadPoolExecutor(max_workers=len(results))
+                for rec in results:
+                    rec._reasoning_fn = executor.submit(rec._reasoning_fn).result
+                executor.shutdown(wait=False)
+
+            self._analysis_cache[cache_key] = (self.depth, results)
             return results
         except Exception as e:
             raise Exception(f"Analysis failed: {e}")
 
+    @classmethod
+    def analyze_batch(cls, boards: List[chess.Board], stockfish_path="/usr/games/stockfish",
+                      depth=15, num_moves=3, workers=None, engine_threads=1):
+        """Analyze many positions in parallel on a pool of engines.
+
+        Spawns `workers` Stockfish processes (default: one per core, divided
+        by engine_threads), pipelines the positions through them with
+        asyncio, and returns the raw engine analysis for each board in input
+        order. Each engine keeps its transposition table warm across the
+        positions it handles, so batches of related positions (e.g. every
+        ply of one game) search far fewer nodes than one-spawn-per-position.
+        """
+        import asyncio
+
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 2) // max(1, engine_threads))
+        workers = max(1, min(workers, len(boards)))
+
+        async def run():
+            engines = []
+            for _ in range(workers):
+                transport, engine = await chess.engine.popen_uci(stockfish_path)
+                await engine.configure({"Threads": engine_threads})
+                engines.append((transport, engine))
+
+            queue = asyncio.Queue()
+            for item in enumerate(boards):
+                queue.put_nowait(item)
+            results = [None] * len(boards)
+
+            async def worker(engine):
+                while True:
+                    try:
+                        index, board = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    results[index] = await engine.analyse(
+                        board, chess.engine.Limit(depth=depth), multipv=num_moves)
+
+            try:
+                await asyncio.gather(*(worker(engine) for _, engine in engines))
+            finally:
+                for _, engine in engines:
+                    await engine.quit()
+            return results
+
+        asyncio.set_event_loop_policy(chess.engine.EventLoopPolicy())
+        return asyncio.run(run())
+
 # ANSI color codes for terminal output
 class Colors:
     WHITE = '\033[97m'
@@ -452,312 +852,568 @@ class Colors:
     BOLD = '\033[1m'
     RESET = '\033[0m'
 
-def detect_opening(board: chess.Board) -> Optional[str]:
-    """Detect opening name from current position."""
-    # Reconstruct moves from starting position
-    temp_board = chess.Board()
-    moves = []
+# Decide color support once at import: when output is piped or the user set
+# NO_COLOR (https://no-color.org), blank every escape sequence so the print
+# path stays branchless and the output carries no ANSI noise.
+if not sys.stdout.isatty() or os.environ.get('NO_COLOR'):
+    for _attr in ('WHITE', 'BLACK', 'GREEN', 'YELLOW', 'BLUE', 'CYAN',
+                  'RED', 'BOLD', 'RESET'):
+        setattr(Colors, _attr, '')
+    del _attr
+
+# Opening book: full FEN -> opening name. Defined at module scope so the
+# table is built exactly once at import time.
+OPENING_PATTERNS = {
+    # === KING'S PAWN OPENINGS (1.e4) ===
+    "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1": "King's Pawn Opening",
+    "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": "King's Pawn Game",
     
-    # This is a simplified approach - in practice, we'd need to track the actual game
-    # For now, we'll use common opening patterns based on piece positions
+    # King's Knight Opening
+    "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2": "King's Knight Opening",
+    "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3": "King's Knight Game",
     
-    opening_patterns = {
-        # === KING'S PAWN OPENINGS (1.e4) ===
-        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1": "King's Pawn Opening",
-        "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": "King's Pawn Game",
-        
-        # King's Knight Opening
-        "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2": "King's Knight Opening",
-        "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3": "King's Knight Game",
-        
-        # Italian Game
-        "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3": "Italian Game",
-        "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4": "Italian Game, Knight Defense",
-        "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 5 4": "Italian Game, Classical",
-        
-        # Spanish/Ruy Lopez
-        "r1bqkbnr/pppp1ppp/2n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3": "Ruy Lopez",
-        "r1bqkbnr/pppp1ppp/2n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3": "Spanish Opening",
-        "r1bqkbnr/pppp2pp/2n2p2/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4": "Ruy Lopez, Steinitz Defense",
-        "r1bqkbnr/1ppp1ppp/p1n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4": "Ruy Lopez, Morphy Defense",
-        "r1bqkb1r/pppp1ppp/2n2n2/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4": "Ruy Lopez, Berlin Defense",
-        
-        # Scotch Game
-        "r1bqkbnr/pppp1ppp/2n5/4p3/3PP3/5N2/PPP2PPP/RNBQKB1R b KQkq - 0 3": "Scotch Game",
-        "r1bqkbnr/pppp1ppp/2n5/8/3pP3/5N2/PPP2PPP/RNBQKB1R w KQkq - 0 4": "Scotch Game, Classical",
-        
-        # Four Knights Game
-        "r1bqkb1r/pppp1ppp/2n2n2/4p3/4P3/2N2N2/PPPP1PPP/R1BQKB1R w KQkq - 4 4": "Four Knights Game",
-        "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/2N2N2/PPPP1PPP/R1B1K2R b KQkq - 5 4": "Four Knights, Fried Liver Attack",
-        
-        # King's Gambit
-        "rnbqkbnr/pppp1ppp/8/4p3/4PP2/8/PPPP2PP/RNBQKBNR b KQkq - 0 2": "King's Gambit",
-        "rnbqkbnr/pppp1p1p/8/4p1p1/4PP2/8/PPPP2PP/RNBQKBNR w KQkq - 0 3": "King's Gambit Accepted",
-        "rnbqkbnr/pppp1ppp/8/8/4Pp2/8/PPPP2PP/RNBQKBNR w KQkq - 0 3": "King's Gambit Declined",
-        
-        # Vienna Game
-        "rnbqkbnr/pppp1ppp/8/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR b KQkq - 1 2": "Vienna Game",
-        "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR w KQkq - 2 3": "Vienna Game, Main Line",
-        
-        # Center Game
-        "rnbqkbnr/pppp1ppp/8/4p3/3PP3/8/PPP2PPP/RNBQKBNR b KQkq - 0 2": "Center Game",
-        
-        # Petrov's Defense
-        "rnbqkb1r/pppp1ppp/5n2/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3": "Petrov's Defense",
-        "rnbqkb1r/pppp1ppp/5n2/4N3/4P3/8/PPPP1PPP/RNBQKB1R b KQkq - 3 3": "Petrov's Defense, Classical",
-        
-        # === SICILIAN DEFENSE VARIATIONS (1.e4 c5) ===
-        "rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": "Sicilian Defense",
-        "rnbqkbnr/pp1ppppp/8/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2": "Sicilian Defense, Open",
-        "rnbqkbnr/pppppppp/8/8/2PP4/8/PP2PPPP/RNBQKBNR b KQkq - 0 2": "Sicilian Defense, Closed",
-        
-        # Sicilian Dragon
-        "rnbqkb1r/pp1ppppp/5n2/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3": "Sicilian Defense, Alekhine Variation",
-        "rnbqk2r/pp1pppbp/5np1/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 3 4": "Sicilian Defense, Dragon Variation",
-        "rnbqkb1r/pp1ppp1p/5np1/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 4": "Sicilian Defense, Accelerated Dragon",
-        
-        # Sicilian Najdorf
-        "rnbqkb1r/1p1ppppp/p4n2/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 0 4": "Sicilian Defense, Najdorf Variation",
-        
-        # === FRENCH DEFENSE (1.e4 e6) ===
-        "rnbqkbnr/pppp1ppp/4p3/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": "French Defense",
-        "rnbqkbnr/pppp1ppp/4p3/8/3PP3/8/PPP2PPP/RNBQKBNR b KQkq - 0 2": "French Defense, Advance Variation",
-        "rnbqkbnr/ppp2ppp/4p3/3p4/3PP3/8/PPP2PPP/RNBQKBNR w KQkq - 0 3": "French Defense, Exchange Variation",
-        "rnbqkbnr/ppp2ppp/4p3/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 3": "French Defense, Exchange Variation",
-        
-        # === CARO-KANN DEFENSE (1.e4 c6) ===
-        "rnbqkbnr/pp1ppppp/2p5/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": "Caro-Kann Defense",
-        "rnbqkbnr/pp1ppppp/2p5/8/3PP3/8/PPP2PPP/RNBQKBNR b KQkq - 0 2": "Caro-Kann Defense, Advance Variation",
-        "rnbqkbnr/pp2pppp/2p5/3p4/3PP3/8/PPP2PPP/RNBQKBNR w KQkq - 0 3": "Caro-Kann Defense, Exchange Variation",
-        
-        # === ALEKHINE'S DEFENSE (1.e4 Nf6) ===
-        "rnbqkb1r/pppppppp/5n2/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 1 2": "Alekhine's Defense",
-        "rnbqkb1r/pppppppp/5n2/8/3PP3/8/PPP2PPP/RNBQKBNR b KQkq - 0 2": "Alekhine's Defense, Chase Variation",
-        
-        # === SCANDINAVIAN DEFENSE (1.e4 d5) ===
-        "rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": "Scandinavian Defense",
-        "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPP2PPP/RNBQKBNR w KQkq - 0 3": "Scandinavian Defense, Modern Variation",
-        
-        # === QUEEN'S PAWN OPENINGS (1.d4) ===
-        "rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq - 0 1": "Queen's Pawn Opening",
-        "rnbqkbnr/ppp1pppp/8/3p4/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 0 2": "Queen's Pawn Game",
-        
-        # Queen's Gambit
-        "rnbqkbnr/ppp1pppp/8/3p4/2PP4/8/PP2PPPP/RNBQKBNR b KQkq - 0 2": "Queen's Gambit",
-        "rnbqkbnr/ppp2ppp/8/3pp3/2PP4/8/PP2PPPP/RNBQKBNR w KQkq - 0 3": "Queen's Gambit Accepted",
-        "rnbqkbnr/ppp1pppp/8/8/2pP4/8/PP2PPPP/RNBQKBNR w KQkq - 0 3": "Queen's Gambit Declined",
-        
-        # King's Indian Defense
-        "rnbqkb1r/pppppp1p/5np1/8/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 2 3": "King's Indian Defense",
-        "rnbqk2r/ppppppbp/5np1/8/2PP4/2N5/PP2PPPP/R1BQKBNR b KQkq - 3 4": "King's Indian Defense, Classical",
-        
-        # Nimzo-Indian Defense  
-        "rnbqk2r/pppp1ppp/4pn2/8/1bPP4/2N5/PP2PPPP/R1BQKBNR w KQkq - 2 4": "Nimzo-Indian Defense",
-        "rnbqk2r/pppp1ppp/4pn2/8/1bPP4/2N2N2/PP2PPPP/R1BQKB1R b KQkq - 3 4": "Nimzo-Indian Defense, Classical",
-        
-        # Queen's Indian Defense
-        "rnbqkb1r/p1pp1ppp/1p2pn2/8/2PP4/5N2/PP2PPPP/RNBQKB1R w KQkq - 0 4": "Queen's Indian Defense",
-        
-        # Grünfeld Defense
-        "rnbqkb1r/ppp1pp1p/5np1/3p4/2PP4/2N5/PP2PPPP/R1BQKBNR b KQkq - 2 4": "Grünfeld Defense",
-        "rnbqk2r/ppp1ppbp/5np1/3p4/2PP4/2N2N2/PP2PPPP/R1BQKB1R b KQkq - 3 5": "Grünfeld Defense, Exchange Variation",
-        
-        # === ENGLISH OPENING (1.c4) ===
-        "rnbqkbnr/pppppppp/8/8/2P5/8/PP1PPPPP/RNBQKBNR b KQkq - 0 1": "English Opening",
-        "rnbqkbnr/pppp1ppp/8/4p3/2P5/8/PP1PPPPP/RNBQKBNR w KQkq - 0 2": "English Opening, King's English",
-        "rnbqkbnr/pp1ppppp/8/2p5/2P5/8/PP1PPPPP/RNBQKBNR w KQkq - 0 2": "English Opening, Symmetrical",
-        "rnbqkb1r/pppppppp/5n2/8/2P5/8/PP1PPPPP/RNBQKBNR w KQkq - 1 2": "English Opening, Anglo-Indian Defense",
-        
-        # === FLANK OPENINGS ===
-        # Réti Opening
-        "rnbqkbnr/pppppppp/8/8/8/5N2/PPPPPPPP/RNBQKB1R b KQkq - 1 1": "Réti Opening",
-        "rnbqkbnr/ppp1pppp/8/3p4/8/5N2/PPPPPPPP/RNBQKB1R w KQkq - 0 2": "Réti Opening, Queen's Pawn Defense",
-        
-        # Bird's Opening
-        "rnbqkbnr/pppppppp/8/8/5P2/8/PPPPP1PP/RNBQKBNR b KQkq - 0 1": "Bird's Opening",
-        "rnbqkbnr/ppp1pppp/8/3p4/5P2/8/PPPPP1PP/RNBQKBNR w KQkq - 0 2": "Bird's Opening, Dutch Defense",
-        
-        # Larsen's Opening
-        "rnbqkbnr/pppppppp/8/8/8/1P6/P1PPPPPP/RNBQKBNR b KQkq - 0 1": "Larsen's Opening",
-        
-        # Polish Opening
-        "rnbqkbnr/pppppppp/8/8/1P6/8/P1PPPPPP/RNBQKBNR b KQkq - 0 1": "Polish Opening",
-        
-        # === IRREGULAR OPENINGS ===
-        "rnbqkbnr/pppp1ppp/8/4p3/4PP2/8/PPPP2PP/RNBQKBNR b KQkq - 0 2": "King's Gambit",
-        "rnbqkbnr/pppp2pp/8/4pp2/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 0 3": "Latvian Gambit",
-        "rnbq1rk1/ppp2ppp/4pn2/3p4/1bPP4/2N2N2/PP2PPPP/R1BQKB1R w KQ - 4 6": "Nimzo-Indian Defense, Rubinstein Variation",
-    }
+    # Italian Game
+    "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3": "Italian Game",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4": "Italian Game, Knight Defense",
+    "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 5 4": "Italian Game, Classical",
+    
+    # Spanish/Ruy Lopez
+    "r1bqkbnr/pppp1ppp/2n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3": "Ruy Lopez",
+    "r1bqkbnr/pppp1ppp/2n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3": "Spanish Opening",
+    "r1bqkbnr/pppp2pp/2n2p2/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4": "Ruy Lopez, Steinitz Defense",
+    "r1bqkbnr/1ppp1ppp/p1n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4": "Ruy Lopez, Morphy Defense",
+    "r1bqkb1r/pppp1ppp/2n2n2/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4": "Ruy Lopez, Berlin Defense",
+    
+    # Scotch Game
+    "r1bqkbnr/pppp1ppp/2n5/4p3/3PP3/5N2/PPP2PPP/RNBQKB1R b KQkq - 0 3": "Scotch Game",
+    "r1bqkbnr/pppp1ppp/2n5/8/3pP3/5N2/PPP2PPP/RNBQKB1R w KQkq - 0 4": "Scotch Game, Classical",
+    
+    # Four Knights Game
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/4P3/2N2N2/PPPP1PPP/R1BQKB1R w KQkq - 4 4": "Four Knights Game",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/2N2N2/PPPP1PPP/R1B1K2R b KQkq - 5 4": "Four Knights, Fried Liver Attack",
+    
+    # King's Gambit
+    "rnbqkbnr/pppp1ppp/8/4p3/4PP2/8/PPPP2PP/RNBQKBNR b KQkq - 0 2": "King's Gambit",
+    "rnbqkbnr/pppp1p1p/8/4p1p1/4PP2/8/PPPP2PP/RNBQKBNR w KQkq - 0 3": "King's Gambit Accepted",
+    "rnbqkbnr/pppp1ppp/8/8/4Pp2/8/PPPP2PP/RNBQKBNR w KQkq - 0 3": "King's Gambit Declined",
+    
+    # Vienna Game
+    "rnbqkbnr/pppp1ppp/8/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR b KQkq - 1 2": "Vienna Game",
+    "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR w KQkq - 2 3": "Vienna Game, Main Line",
+    
+    # Center Game
+    "rnbqkbnr/pppp1ppp/8/4p3/3PP3/8/PPP2PPP/RNBQKBNR b KQkq - 0 2": "Center Game",
+    
+    # Petrov's Defense
+    "rnbqkb1r/pppp1ppp/5n2/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3": "Petrov's Defense",
+    "rnbqkb1r/pppp1ppp/5n2/4N3/4P3/8/PPPP1PPP/RNBQKB1R b KQkq - 3 3": "Petrov's Defense, Classical",
     
-    fen_without_move_counters = " ".join(board.fen().split()[:4])
-    full_fen = board.fen()
+    # === SICILIAN DEFENSE VARIATIONS (1.e4 c5) ===
+    "rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": "Sicilian Defense",
+    "rnbqkbnr/pp1ppppp/8/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2": "Sicilian Defense, Open",
+    "rnbqkbnr/pppppppp/8/8/2PP4/8/PP2PPPP/RNBQKBNR b KQkq - 0 2": "Sicilian Defense, Closed",
     
-    # Check for exact FEN match first
-    if full_fen in opening_patterns:
-        return opening_patterns[full_fen]
+    # Sicilian Dragon
+    "rnbqkb1r/pp1ppppp/5n2/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3": "Sicilian Defense, Alekhine Variation",
+    "rnbqk2r/pp1pppbp/5np1/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 3 4": "Sicilian Defense, Dragon Variation",
+    "rnbqkb1r/pp1ppp1p/5np1/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 4": "Sicilian Defense, Accelerated Dragon",
     
-    # Check for positional match (without move counters)
-    for pattern_fen, name in opening_patterns.items():
-        pattern_without_counters = " ".join(pattern_fen.split()[:4])
-        if fen_without_move_counters == pattern_without_counters:
-            return name
+    # Sicilian Najdorf
+    "rnbqkb1r/1p1ppppp/p4n2/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 0 4": "Sicilian Defense, Najdorf Variation",
     
-    return None
+    # === FRENCH DEFENSE (1.e4 e6) ===
+    "rnbqkbnr/pppp1ppp/4p3/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": "French Defense",
+    "rnbqkbnr/pppp1ppp/4p3/8/3PP3/8/PPP2PPP/RNBQKBNR b KQkq - 0 2": "French Defense, Advance Variation",
+    "rnbqkbnr/ppp2ppp/4p3/3p4/3PP3/8/PPP2PPP/RNBQKBNR w KQkq - 0 3": "French Defense, Exchange Variation",
+    "rnbqkbnr/ppp2ppp/4p3/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 3": "French Defense, Exchange Variation",
+    
+    # === CARO-KANN DEFENSE (1.e4 c6) ===
+    "rnbqkbnr/pp1ppppp/2p5/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": "Caro-Kann Defense",
+    "rnbqkbnr/pp1ppppp/2p5/8/3PP3/8/PPP2PPP/RNBQKBNR b KQkq - 0 2": "Caro-Kann Defense, Advance Variation",
+    "rnbqkbnr/pp2pppp/2p5/3p4/3PP3/8/PPP2PPP/RNBQKBNR w KQkq - 0 3": "Caro-Kann Defense, Exchange Variation",
+    
+    # === ALEKHINE'S DEFENSE (1.e4 Nf6) ===
+    "rnbqkb1r/pppppppp/5n2/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 1 2": "Alekhine's Defense",
+    "rnbqkb1r/pppppppp/5n2/8/3PP3/8/PPP2PPP/RNBQKBNR b KQkq - 0 2": "Alekhine's Defense, Chase Variation",
+    
+    # === SCANDINAVIAN DEFENSE (1.e4 d5) ===
+    "rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": "Scandinavian Defense",
+    "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPP2PPP/RNBQKBNR w KQkq - 0 3": "Scandinavian Defense, Modern Variation",
+    
+    # === QUEEN'S PAWN OPENINGS (1.d4) ===
+    "rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq - 0 1": "Queen's Pawn Opening",
+    "rnbqkbnr/ppp1pppp/8/3p4/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 0 2": "Queen's Pawn Game",
+    
+    # Queen's Gambit
+    "rnbqkbnr/ppp1pppp/8/3p4/2PP4/8/PP2PPPP/RNBQKBNR b KQkq - 0 2": "Queen's Gambit",
+    "rnbqkbnr/ppp2ppp/8/3pp3/2PP4/8/PP2PPPP/RNBQKBNR w KQkq - 0 3": "Queen's Gambit Accepted",
+    "rnbqkbnr/ppp1pppp/8/8/2pP4/8/PP2PPPP/RNBQKBNR w KQkq - 0 3": "Queen's Gambit Declined",
+    
+    # King's Indian Defense
+    "rnbqkb1r/pppppp1p/5np1/8/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 2 3": "King's Indian Defense",
+    "rnbqk2r/ppppppbp/5np1/8/2PP4/2N5/PP2PPPP/R1BQKBNR b KQkq - 3 4": "King's Indian Defense, Classical",
+    
+    # Nimzo-Indian Defense  
+    "rnbqk2r/pppp1ppp/4pn2/8/1bPP4/2N5/PP2PPPP/R1BQKBNR w KQkq - 2 4": "Nimzo-Indian Defense",
+    "rnbqk2r/pppp1ppp/4pn2/8/1bPP4/2N2N2/PP2PPPP/R1BQKB1R b KQkq - 3 4": "Nimzo-Indian Defense, Classical",
+    
+    # Queen's Indian Defense
+    "rnbqkb1r/p1pp1ppp/1p2pn2/8/2PP4/5N2/PP2PPPP/RNBQKB1R w KQkq - 0 4": "Queen's Indian Defense",
+    
+    # Grünfeld Defense
+    "rnbqkb1r/ppp1pp1p/5np1/3p4/2PP4/2N5/PP2PPPP/R1BQKBNR b KQkq - 2 4": "Grünfeld Defense",
+    "rnbqk2r/ppp1ppbp/5np1/3p4/2PP4/2N2N2/PP2PPPP/R1BQKB1R b KQkq - 3 5": "Grünfeld Defense, Exchange Variation",
+    
+    # === ENGLISH OPENING (1.c4) ===
+    "rnbqkbnr/pppppppp/8/8/2P5/8/PP1PPPPP/RNBQKBNR b KQkq - 0 1": "English Opening",
+    "rnbqkbnr/pppp1ppp/8/4p3/2P5/8/PP1PPPPP/RNBQKBNR w KQkq - 0 2": "English Opening, King's English",
+    "rnbqkbnr/pp1ppppp/8/2p5/2P5/8/PP1PPPPP/RNBQKBNR w KQkq - 0 2": "English Opening, Symmetrical",
+    "rnbqkb1r/pppppppp/5n2/8/2P5/8/PP1PPPPP/RNBQKBNR w KQkq - 1 2": "English Opening, Anglo-Indian Defense",
+    
+    # === FLANK OPENINGS ===
+    # Réti Opening
+    "rnbqkbnr/pppppppp/8/8/8/5N2/PPPPPPPP/RNBQKB1R b KQkq - 1 1": "Réti Opening",
+    "rnbqkbnr/ppp1pppp/8/3p4/8/5N2/PPPPPPPP/RNBQKB1R w KQkq - 0 2": "Réti Opening, Queen's Pawn Defense",
+    
+    # Bird's Opening
+    "rnbqkbnr/pppppppp/8/8/5P2/8/PPPPP1PP/RNBQKBNR b KQkq - 0 1": "Bird's Opening",
+    "rnbqkbnr/ppp1pppp/8/3p4/5P2/8/PPPPP1PP/RNBQKBNR w KQkq - 0 2": "Bird's Opening, Dutch Defense",
+    
+    # Larsen's Opening
+    "rnbqkbnr/pppppppp/8/8/8/1P6/P1PPPPPP/RNBQKBNR b KQkq - 0 1": "Larsen's Opening",
+    
+    # Polish Opening
+    "rnbqkbnr/pppppppp/8/8/1P6/8/P1PPPPPP/RNBQKBNR b KQkq - 0 1": "Polish Opening",
+    
+    # === IRREGULAR OPENINGS ===
+    "rnbqkbnr/pppp1ppp/8/4p3/4PP2/8/PPPP2PP/RNBQKBNR b KQkq - 0 2": "King's Gambit",
+    "rnbqkbnr/pppp2pp/8/4pp2/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 0 3": "Latvian Gambit",
+    "rnbq1rk1/ppp2ppp/4pn2/3p4/1bPP4/2N2N2/PP2PPPP/R1BQKB1R w KQ - 4 6": "Nimzo-Indian Defense, Rubinstein Variation",
+}
 
-def get_evaluation_color(eval_str: str, board: chess.Board) -> str:
-    """Get color for evaluation based on advantage level and current player perspective."""
+# Same table re-keyed by python-chess's transposition key (raw bitboards
+# plus turn/castling/ep, maintained incrementally by every board), so a
+# lookup is one hash probe on values the board already holds - no string
+# serialization at all on either side.
+_OPENING_BY_KEY = {}
+for _fen, _name in OPENING_PATTERNS.items():
     try:
-        # Handle mate evaluations
-        if "Mate" in eval_str:
-            # Extract mate sign and consider player perspective
-            mate_is_positive = not eval_str.startswith('-')
-            
-            # Mate evaluations are from White's perspective:
-            # Positive mate = White delivers mate
-            # Negative mate = Black delivers mate
-            if board.turn == chess.WHITE:
-                # White's turn: positive mate = good, negative mate = bad
-                if mate_is_positive:
-                    return Colors.GREEN + Colors.BOLD  # White delivers mate
-                else:
-                    return Colors.RED + Colors.BOLD    # Black delivers mate (bad for White)
+        _OPENING_BY_KEY[chess.Board(_fen)._transposition_key()] = _name
+    except ValueError:
+        continue
+del _fen, _name
+
+# Well-known lines as SAN move sequences. When the analyzed board carries a
+# move stack these resolve an opening straight from the played moves - no
+# position serialization at all - and longest-prefix matching keeps the name
+# alive after the game leaves book.
+_OPENING_MOVE_LINES = {
+    "e4": "King's Pawn Opening",
+    "e4 e5": "King's Pawn Game",
+    "e4 e5 Nf3": "King's Knight Opening",
+    "e4 e5 Nf3 Nc6": "King's Knight Game",
+    "e4 e5 Nf3 Nc6 Bc4": "Italian Game",
+    "e4 e5 Nf3 Nc6 Bc4 Nf6": "Italian Game, Knight Defense",
+    "e4 e5 Nf3 Nc6 Bc4 Bc5": "Italian Game, Classical",
+    "e4 e5 Nf3 Nc6 Bb5": "Ruy Lopez",
+    "e4 e5 Nf3 Nc6 Bb5 a6": "Ruy Lopez, Morphy Defense",
+    "e4 e5 Nf3 Nc6 Bb5 Nf6": "Ruy Lopez, Berlin Defense",
+    "e4 e5 Nf3 Nc6 d4": "Scotch Game",
+    "e4 e5 Nf3 Nf6": "Petrov's Defense",
+    "e4 c5": "Sicilian Defense",
+    "e4 c5 Nf3": "Sicilian Defense, Open",
+    "e4 e6": "French Defense",
+    "e4 e6 d4": "French Defense, Advance Variation",
+    "e4 e6 d4 d5": "French Defense, Exchange Variation",
+    "e4 c6": "Caro-Kann Defense",
+    "e4 d5": "Scandinavian Defense",
+    "e4 Nf6": "Alekhine's Defense",
+    "d4": "Queen's Pawn Opening",
+    "d4 d5": "Queen's Pawn Game",
+    "d4 d5 c4": "Queen's Gambit",
+    "d4 d5 c4 dxc4": "Queen's Gambit Accepted",
+    "d4 d5 c4 e6": "Queen's Gambit Declined",
+    "d4 Nf6 c4 g6": "King's Indian Defense",
+    "c4": "English Opening",
+    "c4 e5": "English Opening, King's English",
+    "c4 c5": "English Opening, Symmetrical",
+}
+
+def _build_opening_move_trie() -> dict:
+    """Re-key _OPENING_MOVE_LINES by tuples of UCI strings.
+
+    UCI, not SAN, so lookups read board.move_stack directly without any
+    SAN rendering (which costs a legal-move generation per move).
+    """
+    trie = {}
+    for line, name in _OPENING_MOVE_LINES.items():
+        line_board = chess.Board()
+        key = []
+        for san in line.split():
+            key.append(line_board.push_san(san).uci())
+        trie[tuple(key)] = name
+    return trie
+
+_OPENING_MOVE_TRIE = _build_opening_move_trie()
+_OPENING_TRIE_MAX_PLIES = max(len(k) for k in _OPENING_MOVE_TRIE)
+
+# The trie keys are moves numbered from the standard starting position, so
+# a board's stack may only be matched against it when that is where the
+# stack actually begins.
+_STARTING_KEY = chess.Board()._transposition_key()
+
+# Optional on-disk opening book next to this script. When present it is
+# mmap'd and binary-searched instead of loading a dict per process - the
+# right shape once the table grows to ECO-database size (~10k entries),
+# and its pages are shared between concurrent invocations.
+OPENING_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openings.bin")
+
+def build_opening_book(path: str = OPENING_BOOK_PATH) -> int:
+    """Compile OPENING_PATTERNS into a sorted binary opening book.
+
+    Layout: u32 row count, then rows of (u64 polyglot Zobrist hash,
+    u32 name offset) sorted by hash, then a pool of NUL-terminated UTF-8
+    names. Returns the number of entries written.
+    """
+    entries = []
+    pool = bytearray()
+    offsets = {}
+    for fen, name in OPENING_PATTERNS.items():
+        try:
+            entry_board = chess.Board(fen)
+        except ValueError:
+            continue
+        if name not in offsets:
+            offsets[name] = len(pool)
+            pool += name.encode("utf-8") + b"\0"
+        entries.append((chess.polyglot.zobrist_hash(entry_board), offsets[name]))
+    entries.sort()
+    with open(path, "wb") as f:
+        f.write(struct.pack("<I", len(entries)))
+        for zobrist, offset in entries:
+            f.write(struct.pack("<QI", zobrist, offset))
+        f.write(bytes(pool))
+    return len(entries)
+
+class _OpeningBook:
+    """Binary search over the mmap'd (hash, offset) rows of openings.bin."""
+
+    _ROW = struct.Struct("<QI")
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (self._count,) = struct.unpack_from("<I", self._mm, 0)
+        self._pool_start = 4 + self._count * self._ROW.size
+
+    def get(self, zobrist: int) -> Optional[str]:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row_hash, offset = self._ROW.unpack_from(self._mm, 4 + mid * self._ROW.size)
+            if row_hash < zobrist:
+                lo = mid + 1
+            elif row_hash > zobrist:
+                hi = mid
             else:
-                # Black's turn: negative mate = good, positive mate = bad  
-                if mate_is_positive:
-                    return Colors.RED + Colors.BOLD    # White delivers mate (bad for Black)
-                else:
-                    return Colors.GREEN + Colors.BOLD  # Black delivers mate
-        
-        # Extract numeric value keeping the sign
-        eval_num = float(eval_str.replace('+', ''))
-        
-        # Adjust evaluation based on whose turn it is
-        # Chess evaluations are from White's perspective
-        if board.turn == chess.BLACK:
-            eval_num = -eval_num  # Flip for Black's perspective
-        
-        # Color based on advantage for current player
-        if eval_num >= 1.0:
-            return Colors.GREEN  # Strong advantage
-        elif eval_num >= 0.3:
-            return Colors.YELLOW  # Slight advantage
-        elif eval_num <= -1.0:
-            return Colors.RED  # Strong disadvantage
-        elif eval_num <= -0.3:
-            return Colors.YELLOW  # Slight disadvantage
-        else:
-            return Colors.WHITE  # Equal/minimal advantage
-    except:
+                end = self._mm.find(b"\0", self._pool_start + offset)
+                return self._mm[self._pool_start + offset:end].decode("utf-8")
+        return None
+
+try:
+    _OPENING_BOOK = _OpeningBook(OPENING_BOOK_PATH) if os.path.exists(OPENING_BOOK_PATH) else None
+except (OSError, ValueError, struct.error):
+    _OPENING_BOOK = None
+
+# Book probes memoized with bounded LRU eviction: get_opening_context
+# probes the current board plus one hypothetical board per candidate move,
+# so multipv analyses revisit the same handful of positions repeatedly.
+@lru_cache(maxsize=4096)
+def _book_opening(zobrist: int) -> Optional[str]:
+    return _OPENING_BOOK.get(zobrist)
+
+def detect_opening(board: chess.Board) -> Optional[str]:
+    """Detect opening name from current position."""
+    # The trie path only applies to stacks replayed from the standard
+    # starting position. Candidate boards built as copy(stack=False) plus
+    # one pushed move carry a 1-move stack rooted mid-game; matching that
+    # lone move as if it were move 1 would shadow the position lookups
+    # below. The ply comparison rejects those cheaply (their ply counter
+    # reflects the real game), the root check catches custom-FEN games
+    # whose counters happen to line up.
+    if (board.move_stack and len(board.move_stack) == board.ply()
+            and board.root()._transposition_key() == _STARTING_KEY):
+        # Longest-prefix match on the played moves themselves; no position
+        # serialization needed, and a game that has left book still reports
+        # the line it came from.
+        ucis = tuple(m.uci() for m in board.move_stack[:_OPENING_TRIE_MAX_PLIES])
+        for end in range(len(ucis), 0, -1):
+            name = _OPENING_MOVE_TRIE.get(ucis[:end])
+            if name is not None:
+                return name
+
+    if _OPENING_BOOK is not None:
+        return _book_opening(chess.polyglot.zobrist_hash(board))
+    # One integer-tuple hash probe on state the board already maintains -
+    # cheap enough that no memo or early reject is needed in front of it.
+    return _OPENING_BY_KEY.get(board._transposition_key())
+
+# Mate color by (side to move, mate sign): mate scores are from White's
+# perspective, so a positive mate is good for White and bad for Black.
+_MATE_COLOR = {
+    (chess.WHITE, True): Colors.GREEN + Colors.BOLD,
+    (chess.WHITE, False): Colors.RED + Colors.BOLD,
+    (chess.BLACK, True): Colors.RED + Colors.BOLD,
+    (chess.BLACK, False): Colors.GREEN + Colors.BOLD,
+}
+
+# Centipawn bands from the mover's perspective: <=-100 strong disadvantage,
+# <=-30 slight disadvantage, <30 roughly equal, <100 slight advantage,
+# >=100 strong advantage. bisect_right picks the band in one step.
+_EVAL_BANDS = (-99, -29, 30, 100)
+_EVAL_BAND_COLORS = (Colors.RED, Colors.YELLOW, Colors.WHITE,
+                     Colors.YELLOW, Colors.GREEN)
+
+def get_evaluation_color(cp: Optional[int], mate: Optional[int], board: chess.Board) -> str:
+    """Get color for evaluation based on advantage level and current player perspective.
+
+    Takes the raw White-perspective score (centipawns, or moves-to-mate
+    when `mate` is set) rather than re-parsing the display string.
+    """
+    if mate is not None:
+        return _MATE_COLOR[(board.turn, mate > 0)]
+
+    if cp is None:
         return Colors.WHITE  # Default
 
+    # Chess evaluations are from White's perspective
+    eval_num = -cp if board.turn == chess.BLACK else cp
+    return _EVAL_BAND_COLORS[bisect.bisect_right(_EVAL_BANDS, eval_num)]
+
 def format_move_sequence(board: chess.Board) -> str:
     """Format the move sequence in a readable format."""
-    if not board.move_stack:
+    stack = board.move_stack
+    if not stack:
         return "(starting position)"
-    
-    moves = []
+
     temp_board = chess.Board()
-    
-    for i, move in enumerate(board.move_stack):
-        move_number = (i // 2) + 1
+    total_pairs = (len(stack) + 1) // 2
+
+    if total_pairs <= 3:
+        cutoff_ply = 0
+        prefix = ""
+    else:
+        # Show the last 3 pairs with ellipsis. Round the cutoff down to a
+        # White move (even ply) so the tail starts with a move number, and
+        # replay the skipped moves without rendering SAN for them - only
+        # the displayed tail pays SAN cost.
+        cutoff_ply = (len(stack) - 5) // 2 * 2
+        prefix = "..."
+        for move in stack[:cutoff_ply]:
+            temp_board.push(move)
+
+    moves = []
+    for i in range(cutoff_ply, len(stack)):
+        move = stack[i]
         if i % 2 == 0:  # White's move
-            moves.append(f"{move_number}.{temp_board.san(move)}")
+            moves.append(f"{(i // 2) + 1}.{temp_board.san(move)}")
         else:  # Black's move
             moves.append(temp_board.san(move))
         temp_board.push(move)
-    
-    total_pairs = (len(board.move_stack) + 1) // 2
-    
-    if total_pairs <= 3:
-        return " ".join(moves)
-    else:
-        # Show last 3 pairs with ellipsis
-        last_moves = []
-        start_index = max(0, len(moves) - 6)  # Last 6 half-moves = 3 pairs
-        
-        # Adjust start_index to begin with a move number
-        while start_index < len(moves) and not moves[start_index].split('.')[0].isdigit():
-            start_index += 1
-        
-        if start_index < len(moves):
-            last_moves = moves[start_index:]
-            return "..." + " ".join(last_moves)
-        else:
-            # Fallback to last few moves
-            return "..." + " ".join(moves[-6:])
-
-def print_analysis(board: chess.Board, analysis: List[Tuple[str, float, str, str]]):
-    """Print formatted analysis results with color coding."""
-    # Color indicators for turn
-    white_indicator = "⚪"
-    black_indicator = "⚫"
-    
-    if board.turn == chess.WHITE:
-        turn_display = f"\n{Colors.BOLD}Turn:{Colors.RESET} {Colors.WHITE}{white_indicator} White{Colors.RESET}"
-    else:
-        turn_display = f"\n{Colors.BOLD}Turn:{Colors.RESET} {Colors.BLACK}{Colors.BOLD}{black_indicator} Black{Colors.RESET}"
-    
-    move_sequence = format_move_sequence(board)
-    print(f"{Colors.BOLD}Move Sequence:{Colors.RESET} {move_sequence}")
-    print(f"{Colors.BOLD}FEN:{Colors.RESET} {board.fen()}")
-    
+
+    return prefix + " ".join(moves)
+
+# Static colored fragments for print_analysis, rendered once at import time
+# instead of being re-concatenated for every position printed.
+_TURN_DISPLAYS = {
+    chess.WHITE: f"\n{Colors.BOLD}Turn:{Colors.RESET} {Colors.WHITE}⚪ White{Colors.RESET}",
+    chess.BLACK: f"\n{Colors.BOLD}Turn:{Colors.RESET} {Colors.BLACK}{Colors.BOLD}⚫ Black{Colors.RESET}",
+}
+_LABEL_MOVES = f"{Colors.BOLD}Move Sequence:{Colors.RESET} "
+_LABEL_FEN = f"{Colors.BOLD}FEN:{Colors.RESET} "
+_LABEL_OPENING = f"{Colors.BOLD}Opening:{Colors.RESET} {Colors.BLUE}{Colors.BOLD}"
+_HEADER_TOP_MOVES = f"\n{Colors.BOLD}Top 3 Recommended Moves:{Colors.RESET}"
+_RULE = "-" * 60
+
+def print_analysis(board: chess.Board, analysis: List[MoveRecommendation],
+                   file=None) -> None:
+    """Print formatted analysis results with color coding.
+
+    The whole report is assembled in one buffer and flushed with a single
+    write: on a tty every print() would flush separately, and on a
+    line-buffered pipe each line costs a syscall. Pass `file` to write the
+    report somewhere other than stdout (e.g. a StringIO).
+    """
+    out = [_LABEL_MOVES + format_move_sequence(board),
+           _LABEL_FEN + board.fen()]
+
     # Detect and display opening name if available
     opening = detect_opening(board)
     if opening:
-        print(f"{Colors.BOLD}Opening:{Colors.RESET} {Colors.BLUE}{Colors.BOLD}{opening}{Colors.RESET}")
-    
-    print(turn_display)
-    print(f"\n{Colors.BOLD}Top 3 Recommended Moves:{Colors.RESET}")
-    print("-" * 60)
-    
-    for i, (move, evaluation, pv, reasoning) in enumerate(analysis, 1):
-        eval_color = get_evaluation_color(evaluation, board)
-        print(f"{Colors.BOLD}{i}.{Colors.RESET} {Colors.BOLD}{move}{Colors.RESET}")
-        print(f"   Evaluation: {eval_color}{evaluation}{Colors.RESET}")
-        print(f"   Principal Variation: {pv}")
-        print(f"   Reasoning: {reasoning}")
-        print()
-
-def main():
-    if len(sys.argv) > 1:
-        # Analyze position from command line arguments
-        position_input = " ".join(sys.argv[1:])
-        
+        out.append(f"{_LABEL_OPENING}{opening}{Colors.RESET}")
+
+    out.append(_TURN_DISPLAYS[board.turn])
+    out.append(_HEADER_TOP_MOVES)
+    out.append(_RULE)
+
+    for i, rec in enumerate(analysis, 1):
+        eval_color = get_evaluation_color(rec.cp, rec.mate, board)
+        out.append(f"{Colors.BOLD}{i}.{Colors.RESET} {Colors.BOLD}{rec.move_san}{Colors.RESET}")
+        out.append(f"   Evaluation: {eval_color}{rec.evaluation}{Colors.RESET}")
+        out.append(f"   Principal Variation: {rec.pv}")
+        out.append(f"   Reasoning: {rec.reasoning}")
+        out.append("")
+
+    (file or sys.stdout).write("\n".join(out) + "\n")
+
+# One socket per user: CLI invocations find a running --serve daemon here.
+SERVER_SOCKET_PATH = os.path.join(tempfile.gettempdir(),
+                                  f"chess_analyzer-{os.getuid()}.sock")
+
+def serve(socket_path: str = SERVER_SOCKET_PATH) -> None:
+    """Run a persistent analysis daemon on a Unix domain socket.
+
+    Keeps one warm Stockfish alive across CLI invocations: a client sends
+    one JSON line ({"fen": ..., "num_moves": ...}) and gets the fully
+    rendered recommendations back, so its start-up cost is a socket connect
+    instead of an engine spawn and UCI handshake - and the daemon's
+    analysis cache and engine transposition table persist between queries.
+    """
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(8)
+    print(f"Analysis daemon listening on {socket_path} (Ctrl-C to stop)")
+    try:
+        with ChessAnalyzer() as analyzer:
+            while True:
+                conn, _ = server.accept()
+                with conn, conn.makefile("rwb") as stream:
+                    line = stream.readline()
+                    if not line:
+                        continue
+                    try:
+                        request = json.loads(line)
+                        request_board = chess.Board(request["fen"])
+                        analysis = analyzer.analyze_position(
+                            request_board, request.get("num_moves", 3))
+                        reply = [{"uci": rec.uci, "move_san": rec.move_san,
+                                  "evaluation": rec.evaluation, "pv": rec.pv,
+                                  "reasoning": rec.reasoning,
+                                  "cp": rec.cp, "mate": rec.mate}
+                                 for rec in analysis]
+                    except Exception as e:
+                        reply = {"error": str(e)}
+                    stream.write(json.dumps(reply).encode("utf-8") + b"\n")
+                    stream.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+def query_server(board: chess.Board, num_moves: int = 3,
+                 socket_path: str = SERVER_SOCKET_PATH) -> Optional[List[MoveRecommendation]]:
+    """Ask a running --serve daemon to analyze `board`.
+
+    Returns None when no daemon is listening so callers can fall back to
+    spawning their own engine.
+    """
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(socket_path)
+    except OSError:
+        conn.close()
+        return None
+    with conn, conn.makefile("rwb") as stream:
+        stream.write(json.dumps({"fen": board.fen(),
+                                 "num_moves": num_moves}).encode("utf-8") + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        return None
+    reply = json.loads(line)
+    if isinstance(reply, dict):
+        raise Exception(f"Analysis failed: {reply.get('error')}")
+    return [MoveRecommendation(entry["uci"], entry["evaluation"], entry["pv"],
+                               (lambda s=entry["move_san"]: s),
+                               (lambda s=entry["reasoning"]: s),
+                               cp=entry["cp"], mate=entry["mate"])
+            for entry in reply]
+
+def analyze_and_print(analyzer: Optional[ChessAnalyzer], position_input: str) -> None:
+    """Parse, analyze and print a single position.
+
+    With analyzer=None the analysis is fetched from a running --serve
+    daemon; if none is listening, a local engine is spawned as before.
+    """
+    board = ChessAnalyzer.parse_position(position_input)
+    if analyzer is not None:
+        analysis = analyzer.analyze_position(board)
+    else:
+        analysis = query_server(board)
+        if analysis is None:
+            with ChessAnalyzer() as local_analyzer:
+                analysis = local_analyzer.analyze_position(board)
+    print_analysis(board, analysis)
+
+def interactive_loop(analyzer: ChessAnalyzer) -> None:
+    """Read positions from stdin and analyze them on one persistent engine.
+
+    Reusing the same engine keeps Stockfish's transposition table warm
+    across related positions, so follow-up queries search far fewer nodes
+    than a fresh process would.
+    """
+    print(f"{Colors.BOLD}Interactive mode{Colors.RESET} - enter a position "
+          f"(moves, FEN or 'start'), or 'quit' to exit.")
+    while True:
         try:
-            analyzer = ChessAnalyzer()
-            
-            # Parse the position
-            board = analyzer.parse_position(position_input)
-            
-            # Analyze the position
-            analysis = analyzer.analyze_position(board)
-            
-            # Print results
-            print_analysis(board, analysis)
-            
+            line = input("position> ").strip()
+        except EOFError:
+            break
+        if not line:
+            continue
+        if line.lower() in ('quit', 'exit'):
+            break
+        try:
+            analyze_and_print(analyzer, line)
         except ValueError as e:
             print(f"{Colors.RED}{e}{Colors.RESET}")
-            sys.exit(1)
-        except Exception as e:
-            print(f"Analysis error: {e}")
-            sys.exit(1)
-    else:
-        # No arguments = analyze starting position
-        try:
-            analyzer = ChessAnalyzer()
-            
-            # Parse starting position
-            board = analyzer.parse_position("start")
-            
-            # Analyze the position
-            analysis = analyzer.analyze_position(board)
-            
-            # Print results
-            print_analysis(board, analysis)
-            
         except Exception as e:
             print(f"Analysis error: {e}")
-            sys.exit(1)
+
+def main() -> None:
+    args = sys.argv[1:]
+    if '--serve' in args:
+        serve()
+        return
+    interactive = '--interactive' in args
+    if interactive:
+        args = [a for a in args if a != '--interactive']
+
+    # No arguments = analyze starting position
+    position_input = " ".join(args) if args else "start"
+
+    try:
+        if interactive:
+            with ChessAnalyzer() as analyzer:
+                interactive_loop(analyzer)
+        else:
+            # Try a running --serve daemon first; a local engine is spawned
+            # only when the socket is silent.
+            analyze_and_print(None, position_input)
+    except ValueError as e:
+        print(f"{Colors.RED}{e}{Colors.RESET}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Analysis error: {e}")
+        sys.exit(1)
+    finally:
+        # Belt and braces for error paths that leaked an analyzer: engines
+        # must be gone before the interpreter starts exiting.
+        close_all_engines()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test script for the chess analyzer with sample positions
+"""
+
+import atexit
+import dbm
+import io
+import shelve
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+
+import chess
+import chess.polyglot
+
+from chess_analyzer import ChessAnalyzer, MoveRecommendation, print_analysis
+
+SEP = '=' * 60
+
+TEST_CASES = [
+    ("Starting position", "start"),
+    ("After 1.e4", "e4"),
+    ("Sicilian Defense", "e4 c5"),
+    ("Italian Game setup", "e4 e5 Nf3 Nc6 Bc4"),
+    ("Ruy Lopez main line", "e4 e5 Nf3 Nc6 Bb5 a6 Ba4 Nf6 O-O Be7 Re1 b5 Bb3 d6"),
+    ("King and pawn endgame", "8/2k5/8/8/3K4/8/3P4/8 w - - 0 1"),
+]
+
+# Fully parsed boards keyed by the raw input string, populated below for
+# the known corpus and extended on miss. A hit skips tokenizing and SAN
+# disambiguation entirely; boards are cached rather than FEN strings so a
+# copy keeps its move history for the move-sequence display.
+_PRECOMPUTED_BOARDS = {}
+
+# Boards keyed by move-token prefix. The test cases share opening prefixes
+# ("e4", "e4 e5 ...", ...), so instead of replaying every sequence from the
+# starting position, parsing resumes from the longest cached prefix and
+# only the remaining moves pay SAN cost.
+_PREFIX_BOARDS = {}
+
+def parse_position_cached(analyzer, position):
+    """analyzer.parse_position with prefix reuse for move-sequence inputs.
+
+    FEN strings and the starting-position keywords don't share state and
+    go straight through; move sequences are resumed from the longest
+    previously parsed prefix and extend the cache as they go.
+    """
+    precomputed = _PRECOMPUTED_BOARDS.get(position)
+    if precomputed is not None:
+        return precomputed.copy()
+
+    tokens = tuple(position.split())
+    if not tokens or '/' in tokens[0] or position.lower() in ('start', 'starting', 'initial', 'new'):
+        return analyzer.parse_position(position)
+
+    matched = 0
+    board = None
+    for end in range(len(tokens), 0, -1):
+        cached = _PREFIX_BOARDS.get(tokens[:end])
+        if cached is not None:
+            board = cached.copy()
+            matched = end
+            break
+    if board is None:
+        board = chess.Board()
+
+    for i in range(matched, len(tokens)):
+        board.push_san(tokens[i])
+        _PREFIX_BOARDS[tokens[:i + 1]] = board.copy()
+
+    _PRECOMPUTED_BOARDS[position] = board.copy()
+    return board
+
+# Parse the corpus's move sequences once at import; workers forked by the
+# process pool inherit the warm tables.
+for _description, _position in TEST_CASES:
+    _tokens = _position.split()
+    if _tokens and '/' not in _tokens[0] and _position.lower() not in ('start', 'starting', 'initial', 'new'):
+        parse_position_cached(None, _position)
+del _description, _position, _tokens
+
+# Analysis results keyed by Zobrist hash, so transposing test cases hit the
+# same entry regardless of the move order that produced the position.
+_ANALYSIS_MEMO = {}
+_ANALYSIS_MEMO_MAX = 256
+
+# On-disk copy of the memo so reruns during development skip the engine
+# entirely. Entries record the search depth, so a rerun at a deeper
+# setting recomputes and upgrades them.
+SHELF_PATH = '.chess_analysis_cache'
+_ANALYSIS_SHELF = None
+
+def _get_shelf():
+    """Open the persistent cache lazily; None if the backing dbm is unavailable
+    (e.g. another pool worker already holds the writer lock)."""
+    global _ANALYSIS_SHELF
+    if _ANALYSIS_SHELF is None:
+        try:
+            _ANALYSIS_SHELF = shelve.open(SHELF_PATH, flag='c')
+            atexit.register(_ANALYSIS_SHELF.close)
+        except (dbm.error, OSError):
+            _ANALYSIS_SHELF = False
+    return _ANALYSIS_SHELF if _ANALYSIS_SHELF is not False else None
+
+def analyze_cached(analyzer, board, num_moves=3):
+    """analyzer.analyze_position memoized in memory and on disk."""
+    key = (chess.polyglot.zobrist_hash(board), num_moves)
+    hit = _ANALYSIS_MEMO.get(key)
+    if hit is not None:
+        return hit
+
+    shelf = _get_shelf()
+    shelf_key = f"{key[0]:016x}:{num_moves}"
+    if shelf is not None:
+        entry = shelf.get(shelf_key)
+        if entry is not None and entry['depth'] >= analyzer.depth:
+            analysis = [MoveRecommendation(m['uci'], m['evaluation'], m['pv'],
+                                           (lambda s=m['move_san']: s),
+                                           (lambda s=m['reasoning']: s),
+                                           cp=m['cp'], mate=m['mate'])
+                        for m in entry['moves']]
+            if len(_ANALYSIS_MEMO) >= _ANALYSIS_MEMO_MAX:
+                _ANALYSIS_MEMO.clear()
+            _ANALYSIS_MEMO[key] = analysis
+            return analysis
+
+    analysis = analyzer.analyze_position(board, num_moves)
+    if shelf is not None:
+        shelf[shelf_key] = {
+            'depth': analyzer.depth,
+            'moves': [{'uci': rec.uci, 'move_san': rec.move_san,
+                       'evaluation': rec.evaluation, 'pv': rec.pv,
+                       'reasoning': rec.reasoning, 'cp': rec.cp, 'mate': rec.mate}
+                      for rec in analysis],
+        }
+    if len(_ANALYSIS_MEMO) >= _ANALYSIS_MEMO_MAX:
+        _ANALYSIS_MEMO.clear()
+    _ANALYSIS_MEMO[key] = analysis
+    return analysis
+
+# One analyzer per process, created on first use. Workers in the process
+# pool each get their own engine; repeat calls (pytest, REPL) reuse it
+# instead of paying engine startup again.
+_ANALYZER = None
+
+def _get_analyzer():
+    """Return the process-local ChessAnalyzer, creating it on first call."""
+    global _ANALYZER
+    if _ANALYZER is None:
+        _ANALYZER = ChessAnalyzer()
+    return _ANALYZER
+
+def _close_analyzer():
+    """Quit the process-local analyzer's engine.
+
+    A pool worker that exits with a live engine hangs forever: the engine
+    runs on a non-daemon thread that the interpreter joins before any
+    atexit hook could quit it. Each case closes the analyzer when done.
+    """
+    global _ANALYZER
+    if _ANALYZER is not None:
+        _ANALYZER.close()
+        _ANALYZER = None
+
+def _run_case(case):
+    """Analyze one test case and return its formatted output.
+
+    Runs in a worker process, so it builds its own analyzer and returns a
+    string for the parent to print — workers never write to stdout directly.
+    """
+    description, position = case
+    buf = io.StringIO()
+    buf.write(f"\n{SEP}\nTesting: {description}\nInput: {position}\n{SEP}\n")
+
+    try:
+        analyzer = _get_analyzer()
+        board = parse_position_cached(analyzer, position)
+        analysis = analyze_cached(analyzer, board)
+        print_analysis(board, analysis, file=buf)
+    except (ValueError, chess.IllegalMoveError, chess.InvalidMoveError,
+            chess.AmbiguousMoveError) as e:
+        # parse_position and push_san report bad inputs with these; anything
+        # else (engine startup, protocol errors) is a real failure and
+        # should propagate with its traceback.
+        buf.write(f"Error: {e}\n")
+    finally:
+        _close_analyzer()
+
+    return buf.getvalue()
+
+def test_positions():
+    """Test the analyzer with various chess positions"""
+    # The cases are independent and compute-bound, so run them across
+    # worker processes; map() keeps the printed order deterministic.
+    with ProcessPoolExecutor() as executor:
+        for output in executor.map(_run_case, TEST_CASES):
+            sys.stdout.write(output)
+
+if __name__ == "__main__":
+    test_positions()